@@ -0,0 +1,146 @@
+import argparse
+import functools
+import os
+import queue
+import time
+import multiprocessing as mp
+import cv2
+import numpy as np
+from config_base import *
+from reconnaissance import analyser_visages, charger_references
+from transport_memoire import AnneauImages, ErreurTraitement, processus_reconnaissance
+
+def traitement_minimal(frame):
+    """Lecture complète de l'image, pour isoler le coût du transport"""
+    return int(frame[::4, ::4].sum())
+
+def processus_reconnaissance_pickle(file_travail, file_resultats, traitement, pret):
+    """Équivalent de processus_reconnaissance où l'image est copiée dans la file"""
+    pret.release()
+    while True:
+        message = file_travail.get()
+        if message is None:
+            break
+
+        identifiant, frame = message
+        try:
+            resultat = traitement(frame)
+        except Exception as e:
+            resultat = ErreurTraitement(f"{type(e).__name__}: {e}")
+        file_resultats.put((identifiant, resultat))
+
+def verifier_travailleurs(travailleurs, anneau):
+    """Lève une erreur si un travailleur est mort, après avoir récupéré ses emplacements"""
+    morts = [travailleur for travailleur in travailleurs if not travailleur.is_alive()]
+    if not morts:
+        return
+
+    if anneau is not None:
+        anneau.recuperer(travailleur.pid for travailleur in morts)
+    codes = ", ".join(str(travailleur.exitcode) for travailleur in morts)
+    raise RuntimeError(f"{len(morts)} travailleur(s) arrêté(s) en cours de mesure (codes {codes})")
+
+def mesurer(transport, images, nb_travailleurs, nb_emplacements, traitement, delai=1.0):
+    """Retourne le nombre d'images traitées par seconde pour un transport donné"""
+    file_travail = mp.Queue(maxsize=nb_emplacements)
+    file_resultats = mp.Queue()
+    pret = mp.Semaphore(0)
+    anneau = None
+
+    if transport == "memoire":
+        anneau = AnneauImages(nb_emplacements, images[0].shape)
+        cible, arguments = processus_reconnaissance, (anneau, file_travail, file_resultats, traitement, pret)
+    else:
+        cible, arguments = processus_reconnaissance_pickle, (file_travail, file_resultats, traitement, pret)
+
+    travailleurs = [mp.Process(target=cible, args=arguments) for _ in range(nb_travailleurs)]
+    try:
+        for travailleur in travailleurs:
+            travailleur.start()
+
+        # Le démarrage des processus n'entre pas dans la mesure
+        for _ in travailleurs:
+            while not pret.acquire(timeout=delai):
+                verifier_travailleurs(travailleurs, anneau)
+
+        # Toutes les attentes sont bornées pour détecter un travailleur mort
+        debut = time.perf_counter()
+        for numero, frame in enumerate(images):
+            if anneau is not None:
+                index = None
+                while index is None:
+                    index = anneau.ecrire(frame, timeout=delai)
+                    if index is None:
+                        verifier_travailleurs(travailleurs, anneau)
+                anneau.publier(index)
+                message = (index, numero)
+            else:
+                message = (numero, frame)
+
+            while True:
+                try:
+                    file_travail.put(message, timeout=delai)
+                    break
+                except queue.Full:
+                    verifier_travailleurs(travailleurs, anneau)
+
+        recus = 0
+        while recus < len(images):
+            try:
+                numero, resultat = file_resultats.get(timeout=delai)
+            except queue.Empty:
+                verifier_travailleurs(travailleurs, anneau)
+                continue
+            if isinstance(resultat, ErreurTraitement):
+                raise RuntimeError(f"Échec du traitement de l'image {numero} : {resultat}")
+            recus += 1
+        duree = time.perf_counter() - debut
+
+        for _ in travailleurs:
+            file_travail.put(None)
+        for travailleur in travailleurs:
+            travailleur.join()
+    finally:
+        for travailleur in travailleurs:
+            if travailleur.is_alive():
+                travailleur.terminate()
+                travailleur.join()
+        if anneau is not None:
+            anneau.fermer()
+
+    return len(images) / duree
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare le transport d'images par mémoire partagée et par pickle")
+    parser.add_argument("--image", default="photos_connues/Moi.jpg", help="Image source, redimensionnée à la taille caméra")
+    parser.add_argument("--images", type=int, default=200, help="Nombre d'images par mesure")
+    parser.add_argument("--travailleurs", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--emplacements", type=int, default=0, help="Taille de l'anneau (défaut : 2 par travailleur)")
+    parser.add_argument("--transport-seul", action="store_true", help="Remplace la reconnaissance par une simple lecture de l'image")
+    args = parser.parse_args()
+
+    frame = cv2.imread(args.image)
+    if frame is None:
+        frame = np.random.randint(0, 256, (CAMERA_HAUTEUR, CAMERA_LARGEUR, 3), dtype=np.uint8)
+    else:
+        frame = cv2.resize(frame, (CAMERA_LARGEUR, CAMERA_HAUTEUR))
+
+    # Des copies distinctes évitent que le pickle profite d'un objet déjà sérialisé
+    images = [frame.copy() for _ in range(args.images)]
+
+    if args.transport_seul:
+        traitement = traitement_minimal
+    else:
+        encodages, noms = charger_references()
+        traitement = functools.partial(analyser_visages, encodages_connus=encodages, noms_connus=noms)
+
+    print(f"{len(images)} images {CAMERA_LARGEUR}x{CAMERA_HAUTEUR}, {os.cpu_count()} coeurs")
+    print(f"{'Travailleurs':>12} {'Pickle (img/s)':>16} {'Mémoire (img/s)':>16} {'Gain':>8}")
+    for nb_travailleurs in args.travailleurs:
+        nb_emplacements = args.emplacements or 2 * nb_travailleurs
+        debit_pickle = mesurer("pickle", images, nb_travailleurs, nb_emplacements, traitement)
+        debit_memoire = mesurer("memoire", images, nb_travailleurs, nb_emplacements, traitement)
+        print(f"{nb_travailleurs:>12} {debit_pickle:>16.1f} {debit_memoire:>16.1f} {debit_memoire / debit_pickle:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import cv2
+
+# Fichier d'annotations attendu à la racine du jeu de test :
+# {
+#     "photo.jpg": [{"nom": "Moi", "boite": [top, right, bottom, left]}],
+#     "clip.mp4": {"0": [...], "30": [...]}
+# }
+# Les boîtes sont en pixels de l'image d'origine. Pour un clip, seules les
+# images annotées (par numéro) sont évaluées. Les noms sont ceux de
+# reconnaissance.IMAGES_REFERENCE ; un visage hors des références est annoté
+# "Inconnu". Une image illisible ou une image de clip jamais atteinte compte
+# ses visages annotés comme faux négatifs.
+FICHIER_ANNOTATIONS = "verite_terrain.json"
+
+SEUIL_RECOUVREMENT = 0.5  # IoU minimal pour apparier une détection et une annotation
+
+# Écarts tolérés par défaut par rapport à la référence : absolus pour les
+# métriques de précision, relatifs pour le débit et pour chaque étape de
+# etapes_ms (où une hausse est une régression)
+TOLERANCES_DEFAUT = {
+    "precision": 0.02,
+    "rappel": 0.02,
+    "taux_identification": 0.02,
+    "images_par_seconde": 0.10,
+    "visages_par_seconde": 0.10,
+    "etapes_ms": 0.15
+}
+
+def analyser_visages(frame, encodages_connus, noms_connus, chronos=None):
+    """Appelle reconnaissance.analyser_visages
+
+    L'import est différé pour que les calculs de métriques de ce module
+    restent utilisables sans dlib.
+    """
+    from reconnaissance import analyser_visages as analyser
+    return analyser(frame, encodages_connus, noms_connus, chronos)
+
+def ratio(numerateur, denominateur):
+    """Divise deux compteurs, 1.0 quand il n'y a rien à compter"""
+    return numerateur / denominateur if denominateur else 1.0
+
+def recouvrement(boite1, boite2):
+    """Calcule l'IoU de deux boîtes (top, right, bottom, left)"""
+    top = max(boite1[0], boite2[0])
+    right = min(boite1[1], boite2[1])
+    bottom = min(boite1[2], boite2[2])
+    left = max(boite1[3], boite2[3])
+
+    intersection = max(0, right - left) * max(0, bottom - top)
+    aire1 = (boite1[1] - boite1[3]) * (boite1[2] - boite1[0])
+    aire2 = (boite2[1] - boite2[3]) * (boite2[2] - boite2[0])
+    union = aire1 + aire2 - intersection
+    return intersection / union if union > 0 else 0
+
+def apparier(resultats, annotations):
+    """Apparie détections et annotations, par IoU décroissant
+
+    Retourne la liste des paires (nom_detecte, nom_attendu) et le nombre de
+    détections et d'annotations restées seules.
+    """
+    candidats = []
+    for i, (boite, _) in enumerate(resultats):
+        for j, annotation in enumerate(annotations):
+            iou = recouvrement(boite, annotation["boite"])
+            if iou >= SEUIL_RECOUVREMENT:
+                candidats.append((iou, i, j))
+    candidats.sort(reverse=True)
+
+    paires = []
+    detections_prises = set()
+    annotations_prises = set()
+    for _, i, j in candidats:
+        if i in detections_prises or j in annotations_prises:
+            continue
+        detections_prises.add(i)
+        annotations_prises.add(j)
+        paires.append((resultats[i][1], annotations[j]["nom"]))
+
+    faux_positifs = len(resultats) - len(paires)
+    faux_negatifs = len(annotations) - len(paires)
+    return paires, faux_positifs, faux_negatifs
+
+def parcourir_jeu(dossier):
+    """Génère (nom_source, image BGR, annotations) pour chaque image annotée
+
+    image vaut None pour une image illisible ou une image de clip que la
+    lecture n'a pas atteinte : ses annotations restent à compter.
+    """
+    with open(os.path.join(dossier, FICHIER_ANNOTATIONS), encoding="utf-8") as f:
+        verite = json.load(f)
+
+    for fichier in sorted(verite):
+        chemin = os.path.join(dossier, fichier)
+        annotations = verite[fichier]
+
+        if isinstance(annotations, list):
+            image = cv2.imread(chemin)
+            if image is None:
+                print(f"Warning: impossible de lire {fichier}")
+            yield fichier, image, annotations
+            continue
+
+        # Clip vidéo : lecture séquentielle jusqu'à la dernière image annotée
+        annotations_par_image = {int(numero): visages for numero, visages in annotations.items()}
+        if not annotations_par_image:
+            print(f"Warning: aucune image annotée pour {fichier}")
+            continue
+
+        capture = cv2.VideoCapture(chemin)
+        if not capture.isOpened():
+            print(f"Warning: impossible d'ouvrir {fichier}")
+
+        derniere = max(annotations_par_image)
+        numero = 0
+        while numero <= derniere and capture.isOpened():
+            ret, image = capture.read()
+            if not ret:
+                break
+            if numero in annotations_par_image:
+                yield f"{fichier}#{numero}", image, annotations_par_image.pop(numero)
+            numero += 1
+        capture.release()
+
+        for numero in sorted(annotations_par_image):
+            print(f"Warning: image {numero} de {fichier} jamais atteinte")
+            yield f"{fichier}#{numero}", None, annotations_par_image[numero]
+
+def evaluer(dossier, encodages_connus, noms_connus, repetitions=3):
+    """Passe le jeu de test dans analyser_visages et calcule les métriques
+
+    Le jeu est relu à chaque passe, une image à la fois, pour ne pas tout
+    garder en mémoire ; seuls les appels à analyser_visages sont chronométrés.
+    Une première image sert à chauffer dlib. Le débit et les étapes sont la
+    médiane de repetitions passes ; la précision vient de la première, le
+    traitement étant déterministe.
+    """
+    nb_images = 0
+    nb_detections = 0
+    vrais_positifs = faux_positifs = faux_negatifs = 0
+    identifications_correctes = 0
+    durees = []
+    chronos_passes = []
+
+    for passe in range(repetitions):
+        chronos = {}
+        duree = 0.0
+
+        for source, image, annotations in parcourir_jeu(dossier):
+            if image is None:
+                if passe == 0:
+                    faux_negatifs += len(annotations)
+                continue
+
+            if passe == 0 and nb_images == 0:
+                analyser_visages(image, encodages_connus, noms_connus)
+
+            debut = time.perf_counter()
+            resultats = analyser_visages(image, encodages_connus, noms_connus, chronos)
+            duree += time.perf_counter() - debut
+
+            if passe > 0:
+                continue
+
+            paires, fp, fn = apparier(resultats, annotations)
+            nb_images += 1
+            nb_detections += len(resultats)
+            vrais_positifs += len(paires)
+            faux_positifs += fp
+            faux_negatifs += fn
+            identifications_correctes += sum(1 for detecte, attendu in paires if detecte == attendu)
+
+            for detecte, attendu in paires:
+                if detecte != attendu:
+                    print(f"  {source}: {attendu} identifié comme {detecte}")
+
+        if nb_images == 0:
+            raise ValueError(f"Aucune image annotée lisible dans {dossier}")
+        durees.append(duree)
+        chronos_passes.append(chronos)
+
+    duree = statistics.median(durees)
+    etapes = set().union(*chronos_passes)
+
+    return {
+        "images": nb_images,
+        "precision": ratio(vrais_positifs, vrais_positifs + faux_positifs),
+        "rappel": ratio(vrais_positifs, vrais_positifs + faux_negatifs),
+        "taux_identification": ratio(identifications_correctes, vrais_positifs),
+        "images_par_seconde": nb_images / duree,
+        "visages_par_seconde": nb_detections / duree,
+        "etapes_ms": {
+            etape: 1000 * statistics.median(chronos.get(etape, 0.0) for chronos in chronos_passes) / nb_images
+            for etape in sorted(etapes)
+        }
+    }
+
+def verifier(nom, obtenu, attendu, limite, regression, regressions):
+    """Affiche une ligne de comparaison et note la régression éventuelle"""
+    etat = "OK"
+    if regression:
+        etat = "RÉGRESSION"
+        regressions.append(nom)
+    print(f"{nom:>22} {obtenu:>10.3f} (référence {attendu:.3f}, limite {limite:.3f}) {etat}")
+
+def comparer(metriques, reference):
+    """Compare aux métriques de référence et retourne la liste des régressions"""
+    tolerances = dict(TOLERANCES_DEFAUT, **reference.get("tolerances", {}))
+    metriques_reference = reference.get("metriques", {})
+    regressions = []
+
+    # Un jeu qui a changé rend toute la comparaison caduque
+    if "images" in metriques_reference and metriques["images"] != metriques_reference["images"]:
+        print(f"{'images':>22} {metriques['images']:>10} (référence {metriques_reference['images']}) JEU DIFFÉRENT")
+        regressions.append("images")
+
+    for nom, tolerance in tolerances.items():
+        if nom not in metriques:
+            print(f"Warning: tolérance {nom} ignorée, aucune métrique de ce nom")
+            continue
+        if nom not in metriques_reference:
+            continue
+
+        # Une étape plus lente que la référence est une régression
+        if nom == "etapes_ms":
+            for etape, attendu in metriques_reference[nom].items():
+                if etape not in metriques[nom]:
+                    continue
+                obtenu = metriques[nom][etape]
+                limite = attendu * (1 + tolerance)
+                verifier(f"{nom}.{etape}", obtenu, attendu, limite, obtenu > limite, regressions)
+            continue
+
+        attendu = metriques_reference[nom]
+        obtenu = metriques[nom]
+
+        # Le débit dépend de la machine : sa tolérance est relative
+        if nom.endswith("_par_seconde"):
+            limite = attendu * (1 - tolerance)
+        else:
+            limite = attendu - tolerance
+        verifier(nom, obtenu, attendu, limite, obtenu < limite, regressions)
+
+    return regressions
+
+def afficher(metriques):
+    """Affiche les métriques d'une évaluation"""
+    print(f"Images évaluées : {metriques['images']}")
+    print(f"Précision : {metriques['precision']:.3f}")
+    print(f"Rappel : {metriques['rappel']:.3f}")
+    print(f"Taux d'identification : {metriques['taux_identification']:.3f}")
+    print(f"Débit : {metriques['images_par_seconde']:.1f} images/s, {metriques['visages_par_seconde']:.1f} visages/s")
+    for etape, duree in metriques["etapes_ms"].items():
+        print(f"  {etape} : {duree:.1f} ms/image")
+
+def main():
+    parser = argparse.ArgumentParser(description="Évalue précision et débit de la reconnaissance sur un jeu annoté")
+    parser.add_argument("dossier", help=f"Dossier d'images et de clips contenant {FICHIER_ANNOTATIONS}")
+    parser.add_argument("--baseline", help="Fichier JSON de référence à comparer")
+    parser.add_argument("--enregistrer", action="store_true", help="Écrit les métriques obtenues dans --baseline")
+    parser.add_argument("--repetitions", type=int, default=3, help="Nombre de passes chronométrées")
+    args = parser.parse_args()
+
+    if args.enregistrer and not args.baseline:
+        parser.error("--enregistrer requiert --baseline")
+    if args.repetitions < 1:
+        parser.error("--repetitions doit valoir au moins 1")
+
+    # Mêmes références et mêmes noms que l'interface lancée par main.py
+    from reconnaissance import charger_references
+    encodages_connus, noms_connus = charger_references()
+    print(f"{len(noms_connus)} visages de référence chargés")
+
+    metriques = evaluer(args.dossier, encodages_connus, noms_connus, args.repetitions)
+    afficher(metriques)
+
+    if not args.baseline:
+        return 0
+
+    if args.enregistrer:
+        reference = {"tolerances": TOLERANCES_DEFAUT}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                reference = json.load(f)
+        reference["metriques"] = metriques
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(reference, f, indent=4, ensure_ascii=False)
+        print(f"Référence enregistrée dans {args.baseline}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        reference = json.load(f)
+
+    print("\nComparaison à la référence :")
+    regressions = comparer(metriques, reference)
+    if regressions:
+        print(f"Régression sur : {', '.join(regressions)}")
+        return 1
+
+    print("Aucune régression")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
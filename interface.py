@@ -1,10 +1,10 @@
 import customtkinter as ctk
 from PIL import Image, ImageTk
 import cv2
-import face_recognition
 import numpy as np
 from datetime import datetime
 from config_base import *
+from reconnaissance import analyser_visages, dessiner_visages
 
 class InterfaceReconnaissance(ctk.CTk):
     def __init__(self, encodages_connus=None, noms_connus=None):
@@ -128,45 +128,8 @@ class InterfaceReconnaissance(ctk.CTk):
             
     def detecter_visages(self, frame):
         """Détecte et reconnaît les visages dans l'image"""
-        # Réduire la taille de l'image pour accélérer le traitement
-        small_frame = cv2.resize(frame, (0, 0), fx=FACTEUR_REDUCTION, fy=FACTEUR_REDUCTION)
-        rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-        
-        # Détecter les visages
-        face_locations = face_recognition.face_locations(rgb_small_frame)
-        if not face_locations:
-            return frame
-            
-        # Obtenir les encodages
-        face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
-        
-        # Pour chaque visage détecté
-        for (top, right, bottom, left), face_encoding in zip(face_locations, face_encodings):
-            # Ajuster les coordonnées à la taille réelle
-            top = int(top / FACTEUR_REDUCTION)
-            right = int(right / FACTEUR_REDUCTION)
-            bottom = int(bottom / FACTEUR_REDUCTION)
-            left = int(left / FACTEUR_REDUCTION)
-            
-            # Vérifier si le visage est connu
-            matches = []
-            if self.known_encodings:
-                matches = face_recognition.compare_faces(self.known_encodings, face_encoding, tolerance=SEUIL_CONFIANCE)
-            
-            nom = "Inconnu"
-            couleur = COULEUR_ERREUR
-            
-            if True in matches:
-                index = matches.index(True)
-                nom = self.known_names[index]
-                couleur = COULEUR_SUCCES
-                
-            # Dessiner le rectangle et le nom
-            cv2.rectangle(frame, (left, top), (right, bottom), couleur, 2)
-            cv2.rectangle(frame, (left, bottom - 35), (right, bottom), couleur, cv2.FILLED)
-            cv2.putText(frame, nom, (left + 6, bottom - 6), cv2.FONT_HERSHEY_DUPLEX, 0.6, COULEUR_TEXTE, 1)
-            
-        return frame
+        resultats = analyser_visages(frame, self.known_encodings, self.known_names)
+        return dessiner_visages(frame, resultats)
         
     def mettre_a_jour_video(self):
         if self.camera_active and self.capture:
@@ -0,0 +1,112 @@
+import os
+import time
+import cv2
+import face_recognition
+from config_base import *
+
+def _chronometrer(chronos, etape, debut):
+    """Ajoute la durée écoulée depuis debut à l'étape et retourne l'instant courant"""
+    maintenant = time.perf_counter()
+    if chronos is not None:
+        chronos[etape] = chronos.get(etape, 0.0) + maintenant - debut
+    return maintenant
+
+# Liste des images de référence : (chemin, nom affiché)
+IMAGES_REFERENCE = [
+    ("photos_connues/Femme.jpg", "Femme"),
+    ("photos_connues/Enfant1.jpg", "Enfant"),
+    ("photos_connues/Moi.jpg", "Moi")
+]
+
+def charger_image_reference(chemin):
+    """Charge une image et vérifie qu'elle contient un visage"""
+    if not os.path.exists(chemin):
+        raise FileNotFoundError(f"L'image {chemin} n'existe pas")
+
+    print(f"Chargement de {chemin}...")
+    image = face_recognition.load_image_file(chemin)
+
+    # Détection du visage
+    face_locations = face_recognition.face_locations(image)
+    if not face_locations:
+        raise ValueError(f"Aucun visage détecté dans {chemin}")
+
+    # Encodage du visage
+    encodages = face_recognition.face_encodings(image, face_locations)
+    if not encodages:
+        raise ValueError(f"Impossible d'encoder le visage dans {chemin}")
+
+    print(f"Visage détecté et encodé dans {chemin}")
+    return encodages[0]
+
+def charger_references(images_reference=IMAGES_REFERENCE):
+    """Encode les images de référence, en ignorant celles qui échouent"""
+    encodages_connus = []
+    noms_connus = []
+
+    for chemin, nom in images_reference:
+        try:
+            encodage = charger_image_reference(chemin)
+            encodages_connus.append(encodage)
+            noms_connus.append(nom)
+        except Exception as e:
+            print(f"Erreur avec {chemin}: {str(e)}")
+
+    return encodages_connus, noms_connus
+
+def analyser_visages(frame, encodages_connus, noms_connus, chronos=None):
+    """Détecte et identifie les visages d'une image BGR sans la modifier
+
+    Retourne une liste de ((top, right, bottom, left), nom) avec les
+    coordonnées ramenées à la taille réelle de l'image. Si chronos est un
+    dictionnaire, la durée de chaque étape y est cumulée en secondes.
+    """
+    debut = time.perf_counter()
+
+    # Réduire la taille de l'image pour accélérer le traitement
+    small_frame = cv2.resize(frame, (0, 0), fx=FACTEUR_REDUCTION, fy=FACTEUR_REDUCTION)
+    rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+    debut = _chronometrer(chronos, "reduction", debut)
+
+    # Détecter les visages
+    face_locations = face_recognition.face_locations(rgb_small_frame)
+    debut = _chronometrer(chronos, "detection", debut)
+    if not face_locations:
+        return []
+
+    # Obtenir les encodages
+    face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
+    debut = _chronometrer(chronos, "encodage", debut)
+
+    resultats = []
+    for (top, right, bottom, left), face_encoding in zip(face_locations, face_encodings):
+        # Ajuster les coordonnées à la taille réelle
+        top = int(top / FACTEUR_REDUCTION)
+        right = int(right / FACTEUR_REDUCTION)
+        bottom = int(bottom / FACTEUR_REDUCTION)
+        left = int(left / FACTEUR_REDUCTION)
+
+        # Vérifier si le visage est connu
+        matches = []
+        if encodages_connus:
+            matches = face_recognition.compare_faces(encodages_connus, face_encoding, tolerance=SEUIL_CONFIANCE)
+
+        nom = "Inconnu"
+        if True in matches:
+            nom = noms_connus[matches.index(True)]
+
+        resultats.append(((top, right, bottom, left), nom))
+
+    _chronometrer(chronos, "comparaison", debut)
+    return resultats
+
+def dessiner_visages(frame, resultats):
+    """Dessine le cadre et le nom de chaque visage analysé sur l'image"""
+    for (top, right, bottom, left), nom in resultats:
+        couleur = COULEUR_ERREUR if nom == "Inconnu" else COULEUR_SUCCES
+
+        cv2.rectangle(frame, (left, top), (right, bottom), couleur, 2)
+        cv2.rectangle(frame, (left, bottom - 35), (right, bottom), couleur, cv2.FILLED)
+        cv2.putText(frame, nom, (left + 6, bottom - 6), cv2.FONT_HERSHEY_DUPLEX, 0.6, COULEUR_TEXTE, 1)
+
+    return frame
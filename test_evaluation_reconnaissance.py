@@ -0,0 +1,169 @@
+import json
+import cv2
+import numpy as np
+import pytest
+import evaluation_reconnaissance
+from evaluation_reconnaissance import apparier, comparer, evaluer, parcourir_jeu, ratio, recouvrement
+
+BOITE = (0, 10, 10, 0)
+
+def annotation(nom, boite):
+    return {"nom": nom, "boite": boite}
+
+def test_recouvrement_boites_identiques():
+    assert recouvrement((0, 10, 10, 0), (0, 10, 10, 0)) == 1
+
+def test_recouvrement_boites_disjointes():
+    assert recouvrement((0, 10, 10, 0), (20, 30, 30, 20)) == 0
+
+def test_recouvrement_partiel():
+    # Intersection 5x10 = 50, union 100 + 100 - 50 = 150
+    assert recouvrement((0, 10, 10, 0), (0, 15, 10, 5)) == pytest.approx(50 / 150)
+
+def test_recouvrement_boite_vide():
+    assert recouvrement((0, 0, 0, 0), (0, 0, 0, 0)) == 0
+
+def test_apparier_compte_faux_positifs_et_negatifs():
+    resultats = [((0, 10, 10, 0), "Moi"), ((100, 110, 110, 100), "Inconnu")]
+    annotations = [annotation("Moi", (0, 10, 10, 0)), annotation("Femme", (50, 60, 60, 50))]
+
+    paires, faux_positifs, faux_negatifs = apparier(resultats, annotations)
+
+    assert paires == [("Moi", "Moi")]
+    assert faux_positifs == 1
+    assert faux_negatifs == 1
+
+def test_apparier_ignore_un_recouvrement_insuffisant():
+    resultats = [((0, 10, 10, 0), "Moi")]
+    annotations = [annotation("Moi", (0, 20, 10, 10))]
+
+    assert apparier(resultats, annotations) == ([], 1, 1)
+
+def test_apparier_privilegie_le_meilleur_recouvrement():
+    # A recouvre X à 0,6 et Y à 0,9 ; B ne recouvre que X, à 0,8. Un appariement
+    # dans l'ordre des indices donnerait A-X et laisserait B seul
+    resultats = [((0, 20, 10, 0), "A"), ((0, 23, 10, 8), "B")]
+    annotations = [annotation("X", (0, 20, 10, 8)), annotation("Y", (0, 18, 10, 0))]
+
+    paires, faux_positifs, faux_negatifs = apparier(resultats, annotations)
+
+    assert sorted(paires) == [("A", "Y"), ("B", "X")]
+    assert (faux_positifs, faux_negatifs) == (0, 0)
+
+def test_apparier_une_annotation_pour_une_seule_detection():
+    resultats = [((0, 10, 10, 0), "Moi"), ((0, 10, 10, 0), "Moi")]
+    annotations = [annotation("Moi", (0, 10, 10, 0))]
+
+    paires, faux_positifs, faux_negatifs = apparier(resultats, annotations)
+
+    assert paires == [("Moi", "Moi")]
+    assert (faux_positifs, faux_negatifs) == (1, 0)
+
+def metriques(**valeurs):
+    base = {
+        "images": 10,
+        "precision": 0.9,
+        "rappel": 0.9,
+        "taux_identification": 0.9,
+        "images_par_seconde": 10.0,
+        "visages_par_seconde": 10.0,
+        "etapes_ms": {"detection": 100.0}
+    }
+    base.update(valeurs)
+    return base
+
+def test_comparer_sans_regression():
+    assert comparer(metriques(), {"metriques": metriques()}) == []
+
+def test_comparer_tolerance_absolue_pour_la_precision():
+    reference = {"metriques": metriques(), "tolerances": {"precision": 0.05}}
+
+    assert comparer(metriques(precision=0.86), reference) == []
+    assert comparer(metriques(precision=0.84), reference) == ["precision"]
+
+def test_comparer_tolerance_relative_pour_le_debit():
+    reference = {"metriques": metriques(images_par_seconde=100.0), "tolerances": {"images_par_seconde": 0.1}}
+
+    assert comparer(metriques(images_par_seconde=91.0), reference) == []
+    assert comparer(metriques(images_par_seconde=89.0), reference) == ["images_par_seconde"]
+
+def test_comparer_etape_plus_lente_est_une_regression():
+    reference = {"metriques": metriques(), "tolerances": {"etapes_ms": 0.1}}
+
+    assert comparer(metriques(etapes_ms={"detection": 109.0}), reference) == []
+    assert comparer(metriques(etapes_ms={"detection": 111.0}), reference) == ["etapes_ms.detection"]
+    assert comparer(metriques(etapes_ms={"detection": 50.0}), reference) == []
+
+def test_comparer_ignore_une_tolerance_inconnue():
+    reference = {"metriques": metriques(), "tolerances": {"inexistante": 0.1}}
+
+    assert comparer(metriques(), reference) == []
+
+def test_comparer_ignore_une_metrique_absente_de_la_reference():
+    reference = {"metriques": {"precision": 0.9}}
+
+    assert comparer(metriques(rappel=0.1), reference) == []
+
+def test_comparer_jeu_different_est_une_regression():
+    assert comparer(metriques(images=9), {"metriques": metriques()}) == ["images"]
+
+def test_ratio_vaut_un_sans_rien_a_compter():
+    assert ratio(0, 0) == 1.0
+    assert ratio(1, 4) == 0.25
+
+def creer_jeu(dossier):
+    image = np.zeros((20, 20, 3), dtype=np.uint8)
+    cv2.imwrite(str(dossier / "a.png"), image)
+    cv2.imwrite(str(dossier / "b.png"), image)
+
+    writer = cv2.VideoWriter(str(dossier / "clip.avi"), cv2.VideoWriter_fourcc(*"MJPG"), 10, (20, 20))
+    for _ in range(5):
+        writer.write(image)
+    writer.release()
+
+    verite = {
+        "a.png": [annotation("Moi", BOITE)],
+        "b.png": [annotation("Femme", BOITE)],
+        "absente.png": [annotation("Moi", BOITE)],
+        "clip.avi": {
+            "1": [],
+            "3": [annotation("Moi", BOITE)],
+            "8": [annotation("Enfant", (50, 60, 60, 50))]
+        },
+        "vide.avi": {}
+    }
+    with open(dossier / evaluation_reconnaissance.FICHIER_ANNOTATIONS, "w", encoding="utf-8") as f:
+        json.dump(verite, f)
+
+def analyser_factice(frame, encodages_connus, noms_connus, chronos=None):
+    if chronos is not None:
+        chronos["detection"] = chronos.get("detection", 0.0) + 0.002
+    return [(BOITE, "Moi")]
+
+def test_parcourir_jeu_selectionne_les_images_annotees(tmp_path):
+    creer_jeu(tmp_path)
+
+    jeu = [(source, image is not None) for source, image, _ in parcourir_jeu(str(tmp_path))]
+
+    assert jeu == [
+        ("a.png", True),
+        ("absente.png", False),
+        ("b.png", True),
+        ("clip.avi#1", True),
+        ("clip.avi#3", True),
+        ("clip.avi#8", False)
+    ]
+
+def test_evaluer_sur_un_jeu_annote(tmp_path, monkeypatch):
+    creer_jeu(tmp_path)
+    monkeypatch.setattr(evaluation_reconnaissance, "analyser_visages", analyser_factice)
+
+    resultat = evaluer(str(tmp_path), [], [], repetitions=3)
+
+    # 3 paires (a, b, clip#3), une détection de trop (clip#1) et deux visages
+    # manqués (absente.png, clip#8 jamais atteinte) ; b est mal identifiée
+    assert resultat["images"] == 4
+    assert resultat["precision"] == pytest.approx(3 / 4)
+    assert resultat["rappel"] == pytest.approx(3 / 5)
+    assert resultat["taux_identification"] == pytest.approx(2 / 3)
+    assert resultat["etapes_ms"] == {"detection": pytest.approx(2.0)}
@@ -0,0 +1,187 @@
+import multiprocessing as mp
+import os
+import queue
+from multiprocessing import shared_memory
+import numpy as np
+import pytest
+import cv2
+from transport_memoire import AnneauImages, ErreurTraitement, processus_capture, processus_reconnaissance
+
+FORME = (8, 8, 3)
+FORME_CLIP = (48, 64, 3)
+
+def traitement_minimal(frame):
+    return int(frame.sum())
+
+def traitement_en_erreur(frame):
+    raise ValueError("image invalide")
+
+def traitement_fatal(frame):
+    os._exit(3)
+
+def image(valeur):
+    return np.full(FORME, valeur, dtype=np.uint8)
+
+@pytest.fixture
+def contexte():
+    # spawn est le mode par défaut sous Windows : l'anneau y passe par pickle
+    return mp.get_context("spawn")
+
+@pytest.fixture
+def anneau(contexte):
+    anneau = AnneauImages(2, FORME, contexte=contexte)
+    yield anneau
+    if anneau.emplacements is not None:
+        anneau.fermer()
+
+def lancer_travailleur(contexte, anneau, traitement):
+    file_travail = contexte.Queue()
+    file_resultats = contexte.Queue()
+    travailleur = contexte.Process(
+        target=processus_reconnaissance,
+        args=(anneau, file_travail, file_resultats, traitement)
+    )
+    travailleur.start()
+    return travailleur, file_travail, file_resultats
+
+def publier(anneau, file_travail, valeur, identifiant):
+    index = anneau.ecrire(image(valeur))
+    anneau.publier(index)
+    file_travail.put((index, identifiant))
+
+def test_ecrire_retourne_none_quand_l_anneau_est_plein(anneau):
+    assert anneau.ecrire(image(1), timeout=1) is not None
+    assert anneau.ecrire(image(2), timeout=1) is not None
+    assert anneau.ecrire(image(3), timeout=0.05) is None
+    assert anneau.reserver(timeout=0.05) is None
+
+def test_liberer_rend_l_emplacement(anneau):
+    index = anneau.ecrire(image(7), timeout=1)
+    anneau.reserver(timeout=1)
+
+    assert anneau.emplacement(index).max() == 7
+    anneau.liberer(index)
+    assert anneau.reserver(timeout=1) == index
+
+def test_ecriture_invalide_ne_perd_pas_d_emplacement(anneau):
+    with pytest.raises(ValueError):
+        anneau.ecrire(np.zeros((4, 4, 3), dtype=np.uint8), timeout=1)
+
+    assert anneau.reserver(timeout=1) is not None
+    assert anneau.reserver(timeout=1) is not None
+
+def test_recuperer_ignore_les_emplacements_en_transit(anneau):
+    publie = anneau.reserver(timeout=1)
+    detenu = anneau.reserver(timeout=1)
+    anneau.publier(publie)
+
+    assert anneau.recuperer([os.getpid()]) == 1
+    assert anneau.reserver(timeout=1) == detenu
+    assert anneau.reserver(timeout=0.05) is None
+
+def test_travailleur_spawn_lit_les_images_sur_place(anneau, contexte):
+    travailleur, file_travail, file_resultats = lancer_travailleur(contexte, anneau, traitement_minimal)
+    for numero in range(5):
+        publier(anneau, file_travail, numero, numero)
+
+    resultats = dict(file_resultats.get(timeout=30) for _ in range(5))
+    file_travail.put(None)
+    travailleur.join(timeout=30)
+
+    assert resultats == {numero: traitement_minimal(image(numero)) for numero in range(5)}
+    assert travailleur.exitcode == 0
+
+def test_erreur_de_traitement_est_renvoyee(anneau, contexte):
+    travailleur, file_travail, file_resultats = lancer_travailleur(contexte, anneau, traitement_en_erreur)
+    publier(anneau, file_travail, 1, "a")
+
+    identifiant, resultat = file_resultats.get(timeout=30)
+    assert identifiant == "a"
+    assert isinstance(resultat, ErreurTraitement)
+    assert travailleur.is_alive()
+
+    # L'emplacement a été rendu malgré l'erreur
+    assert anneau.reserver(timeout=1) is not None
+    assert anneau.reserver(timeout=1) is not None
+
+    file_travail.put(None)
+    travailleur.join(timeout=30)
+    assert travailleur.exitcode == 0
+
+def test_emplacement_d_un_travailleur_mort_est_recupere(anneau, contexte):
+    travailleur, file_travail, file_resultats = lancer_travailleur(contexte, anneau, traitement_fatal)
+    publier(anneau, file_travail, 1, "a")
+    travailleur.join(timeout=30)
+
+    assert travailleur.exitcode == 3
+    assert anneau.recuperer([travailleur.pid]) == 1
+    assert anneau.reserver(timeout=1) is not None
+    assert anneau.reserver(timeout=1) is not None
+    with pytest.raises(queue.Empty):
+        file_resultats.get(timeout=0.1)
+
+def test_seul_le_createur_supprime_la_memoire(anneau, contexte):
+    nom = anneau.memoire.name
+    travailleur, file_travail, _ = lancer_travailleur(contexte, anneau, traitement_minimal)
+    file_travail.put(None)
+    travailleur.join(timeout=30)
+
+    # Le travailleur a fermé sa copie sans supprimer le segment
+    attache = shared_memory.SharedMemory(name=nom)
+    attache.close()
+
+    anneau.fermer()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=nom)
+
+def ecrire_clip(chemin, nb_images):
+    largeur, hauteur = FORME_CLIP[1], FORME_CLIP[0]
+    writer = cv2.VideoWriter(str(chemin), cv2.VideoWriter_fourcc(*"MJPG"), 10, (largeur, hauteur))
+    for numero in range(nb_images):
+        writer.write(np.full(FORME_CLIP, 20 * numero, dtype=np.uint8))
+    writer.release()
+
+def test_capture_publie_chaque_image_d_un_clip(tmp_path, contexte):
+    chemin = str(tmp_path / "clip.avi")
+    ecrire_clip(chemin, 10)
+
+    anneau = AnneauImages(2, FORME_CLIP, contexte=contexte)
+    try:
+        file_travail = contexte.Queue()
+        file_resultats = contexte.Queue()
+        arret = contexte.Event()
+        capture = contexte.Process(
+            target=processus_capture,
+            args=(chemin, anneau, file_travail, arret),
+            kwargs={"timeout": None, "nb_travailleurs": 1}
+        )
+        travailleur = contexte.Process(
+            target=processus_reconnaissance,
+            args=(anneau, file_travail, file_resultats, traitement_minimal)
+        )
+        capture.start()
+        travailleur.start()
+
+        resultats = dict(file_resultats.get(timeout=30) for _ in range(10))
+        capture.join(timeout=30)
+        travailleur.join(timeout=30)
+    finally:
+        anneau.fermer()
+
+    assert sorted(resultats) == [(chemin, numero) for numero in range(10)]
+    assert capture.exitcode == 0
+    # La fin du flux a arrêté le travailleur
+    assert travailleur.exitcode == 0
+
+def test_capture_source_introuvable_echoue(tmp_path, anneau, contexte):
+    file_travail = contexte.Queue()
+    capture = contexte.Process(
+        target=processus_capture,
+        args=(str(tmp_path / "absent.avi"), anneau, file_travail, contexte.Event())
+    )
+    capture.start()
+    capture.join(timeout=30)
+
+    assert capture.exitcode != 0
+    with pytest.raises(queue.Empty):
+        file_travail.get(timeout=0.1)
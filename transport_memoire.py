@@ -0,0 +1,222 @@
+import os
+import queue
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+
+# Marque d'un emplacement publié par un producteur mais pas encore pris par un travailleur
+EN_TRANSIT = -1
+
+class ErreurTraitement(Exception):
+    """Erreur levée par le traitement d'une image, renvoyée à la place du résultat"""
+
+class AnneauImages:
+    def __init__(self, nb_emplacements, forme, dtype=np.uint8, contexte=None):
+        """Crée un anneau d'emplacements d'images en mémoire partagée
+
+        Les images sont écrites une fois dans un emplacement préalloué et lues
+        sur place par les processus de reconnaissance : seuls les indices
+        d'emplacement transitent par les files. L'anneau se transmet tel quel
+        en argument d'un multiprocessing.Process, créé avec le même contexte
+        (par défaut celui de multiprocessing).
+        """
+        contexte = contexte or mp.get_context()
+        self.nb_emplacements = nb_emplacements
+        self.forme = tuple(forme)
+        self.dtype = np.dtype(dtype)
+        # Avec fork l'objet est hérité sans pickle : seul le processus créateur supprime le segment
+        self.pid_proprietaire = os.getpid()
+
+        taille_emplacement = int(np.prod(self.forme)) * self.dtype.itemsize
+        self.memoire = shared_memory.SharedMemory(create=True, size=taille_emplacement * nb_emplacements)
+
+        # Seuls nb_emplacements indices circulent : le producteur attend qu'un se libère
+        self.libres = contexte.Queue()
+        for index in range(nb_emplacements):
+            self.libres.put(index)
+
+        # pid du processus qui détient chaque emplacement, 0 s'il est libre
+        self.proprietaires = contexte.RawArray("q", nb_emplacements)
+
+        self._creer_vues()
+
+    def _creer_vues(self):
+        self.emplacements = np.ndarray(
+            (self.nb_emplacements,) + self.forme,
+            dtype=self.dtype,
+            buffer=self.memoire.buf
+        )
+
+    def __getstate__(self):
+        return {
+            "nom": self.memoire.name,
+            "nb_emplacements": self.nb_emplacements,
+            "forme": self.forme,
+            "dtype": self.dtype.str,
+            "pid_proprietaire": self.pid_proprietaire,
+            "libres": self.libres,
+            "proprietaires": self.proprietaires
+        }
+
+    def __setstate__(self, etat):
+        """Rattache l'anneau dans un processus enfant sans le recréer"""
+        self.nb_emplacements = etat["nb_emplacements"]
+        self.forme = etat["forme"]
+        self.dtype = np.dtype(etat["dtype"])
+        self.libres = etat["libres"]
+        self.pid_proprietaire = etat["pid_proprietaire"]
+        self.proprietaires = etat["proprietaires"]
+        self.memoire = shared_memory.SharedMemory(name=etat["nom"])
+        self._creer_vues()
+
+    def reserver(self, timeout=None):
+        """Réserve un emplacement libre, ou retourne None si aucun ne se libère à temps"""
+        try:
+            index = self.libres.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+        self.proprietaires[index] = os.getpid()
+        return index
+
+    def prendre(self, index):
+        """Marque un emplacement reçu dans une file comme détenu par ce processus"""
+        self.proprietaires[index] = os.getpid()
+
+    def emplacement(self, index):
+        """Retourne la vue numpy d'un emplacement, sans copie"""
+        return self.emplacements[index]
+
+    def liberer(self, index):
+        """Rend un emplacement à l'anneau une fois son image consommée"""
+        self.proprietaires[index] = 0
+        self.libres.put(index)
+
+    def publier(self, index):
+        """Marque un emplacement comme confié à une file, à appeler avant de l'y déposer"""
+        self.proprietaires[index] = EN_TRANSIT
+
+    def recuperer(self, pids):
+        """Rend à l'anneau les emplacements détenus par des processus morts
+
+        Sans cela, un travailleur tué pendant un traitement garde son emplacement
+        indéfiniment. Seuls des processus terminés doivent figurer dans pids. Un
+        emplacement encore dans une file (EN_TRANSIT) n'est pas concerné : un
+        autre travailleur le prendra. Retourne le nombre d'emplacements rendus.
+
+        Deux cas ne sont pas couverts et perdent l'emplacement pour de bon : un
+        processus tué entre la lecture du message dans la file et prendre()
+        (l'emplacement reste EN_TRANSIT sans message), et un processus tué dans
+        liberer() entre la remise à 0 du propriétaire et le retour dans libres.
+        """
+        pids = set(pids)
+        recuperes = 0
+        for index in range(self.nb_emplacements):
+            if self.proprietaires[index] in pids:
+                self.liberer(index)
+                recuperes += 1
+        return recuperes
+
+    def ecrire(self, image, timeout=None):
+        """Copie une image dans un emplacement libre et retourne son index
+
+        Retourne None si l'anneau reste plein pendant timeout secondes : l'image
+        est alors abandonnée plutôt que d'accumuler du retard.
+        """
+        index = self.reserver(timeout)
+        if index is None:
+            return None
+
+        try:
+            np.copyto(self.emplacements[index], image, casting="no")
+        except Exception:
+            # Une image de forme ou de type inattendu ne doit pas faire perdre l'emplacement
+            self.liberer(index)
+            raise
+        return index
+
+    def fermer(self):
+        """Détache la mémoire partagée et la supprime dans le processus créateur"""
+        # Les vues numpy doivent disparaître avant la fermeture du segment
+        self.emplacements = None
+        self.memoire.close()
+        if os.getpid() == self.pid_proprietaire:
+            self.memoire.unlink()
+
+def processus_capture(source, anneau, file_travail, arret, timeout=0.1, nb_travailleurs=0):
+    """Lit une caméra ou une vidéo et publie les images dans l'anneau
+
+    Les messages de file_travail sont des tuples (index, (source, numero)). Avec
+    un timeout, l'image courante est abandonnée quand l'anneau reste plein : une
+    caméra en direct ne doit pas prendre de retard sur les processus de
+    reconnaissance. Avec timeout=None aucune image n'est perdue.
+
+    Le processus se termine à la fin du flux ou quand arret est levé, et envoie
+    alors nb_travailleurs None pour arrêter les processus de reconnaissance.
+    Avec plusieurs captures, laisser nb_travailleurs à 0 et envoyer les None
+    une fois toutes les captures terminées. Une source impossible à ouvrir lève
+    IOError, le processus sort donc avec un code non nul.
+    """
+    capture = cv2.VideoCapture(source)
+    try:
+        if not capture.isOpened():
+            raise IOError(f"Impossible d'accéder à la source {source}")
+
+        hauteur, largeur = anneau.forme[:2]
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, largeur)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, hauteur)
+
+        numero = 0
+        while not arret.is_set():
+            ret, frame = capture.read()
+            if not ret:
+                break
+
+            if frame.shape != anneau.forme:
+                frame = cv2.resize(frame, (largeur, hauteur))
+
+            index = anneau.ecrire(frame, timeout=timeout)
+            if index is None:
+                continue
+
+            anneau.publier(index)
+            file_travail.put((index, (source, numero)))
+            numero += 1
+
+        for _ in range(nb_travailleurs):
+            file_travail.put(None)
+    finally:
+        capture.release()
+        anneau.fermer()
+
+def processus_reconnaissance(anneau, file_travail, file_resultats, traitement, pret=None):
+    """Traite sur place les images de l'anneau jusqu'à recevoir None
+
+    traitement reçoit la vue de l'emplacement et ne doit pas la conserver :
+    l'emplacement est rendu dès son retour. Les résultats sont publiés sous la
+    forme (identifiant, resultat), identifiant étant celui fourni par le
+    producteur ; si traitement lève une exception, resultat est une
+    ErreurTraitement et le processus continue.
+    """
+    if pret is not None:
+        pret.release()
+
+    try:
+        while True:
+            message = file_travail.get()
+            if message is None:
+                break
+
+            index, identifiant = message
+            anneau.prendre(index)
+            try:
+                resultat = traitement(anneau.emplacement(index))
+            except Exception as e:
+                resultat = ErreurTraitement(f"{type(e).__name__}: {e}")
+            finally:
+                anneau.liberer(index)
+
+            file_resultats.put((identifiant, resultat))
+    finally:
+        anneau.fermer()